@@ -5,9 +5,10 @@ from __future__ import annotations
 import logging
 
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.unit_system import METRIC_SYSTEM
 
-from .const import MAX_RETRIES_AFTER_STARTUP
+from .const import DEVICE_SENSORS, MAX_RETRIES_AFTER_STARTUP
 from .coordinator import TDBLEConfigEntry, TDBLEDataUpdateCoordinator
 
 PLATFORMS: list[Platform] = [Platform.SENSOR]
@@ -21,21 +22,51 @@ type TDConfigEntry = ConfigEntry[ActiveBluetoothProcessorCoordinator]
 async def async_setup_entry(hass: HomeAssistant, entry: TDConfigEntry) -> bool:
     """Set up Transducers Direct BLE device from a config entry."""
     _LOGGER.debug("Running async_setup_entry")
-    coordinator = TDBLEDataUpdateCoordinator(hass, entry)
+    # The unit system is stable for the lifetime of the install
+    is_metric = hass.config.units is METRIC_SYSTEM
+    coordinator = TDBLEDataUpdateCoordinator(hass, entry, is_metric)
     await coordinator.async_config_entry_first_refresh()
 
     coordinator.td.set_max_attempts(MAX_RETRIES_AFTER_STARTUP)
 
     entry.runtime_data = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    if _has_device_sensors(coordinator):
+        coordinator.platforms_forwarded = True
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    else:
+        # Nothing to create entities for yet, so wait for the device data
+        _LOGGER.debug("No sensors received yet, postponing the platforms setup")
+        entry.async_on_unload(
+            coordinator.async_add_listener(
+                lambda: _async_forward_entry_setups_when_ready(hass, entry)
+            )
+        )
 
     return True
 
 
+def _has_device_sensors(coordinator: TDBLEDataUpdateCoordinator) -> bool:
+    """Check the device reported sensors, the signal strength comes from advertisements."""
+    return bool(coordinator.data.sensors.keys() & DEVICE_SENSORS)
+
+
+@callback
+def _async_forward_entry_setups_when_ready(hass: HomeAssistant, entry: TDBLEConfigEntry) -> None:
+    """Forward the entry setup to the platforms once the device reported the sensors."""
+    coordinator = entry.runtime_data
+    if coordinator.platforms_forwarded or not _has_device_sensors(coordinator):
+        return
+    coordinator.platforms_forwarded = True
+
+    entry.async_create_task(hass, hass.config_entries.async_forward_entry_setups(entry, PLATFORMS))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: TDBLEConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.debug("Running async_unload_entry")
     coord = entry.runtime_data
     await coord.disconnect()
+    if not coord.platforms_forwarded:
+        return True
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
@@ -29,7 +29,7 @@ class Discovery:
 
     name: str
     discovery_info: BluetoothServiceInfo
-    device: TDDevice
+    device: TDDevice | None
 
 
 def get_name(device: TDDevice) -> str:
@@ -48,8 +48,8 @@ def is_device_supported(service_info: BluetoothServiceInfo) -> bool:
     """Update from BLE advertisement data."""
     _LOGGER.debug("Parsing TD BLE advertisement data: %s", service_info)
     manufacturer_data = service_info.manufacturer_data
-    address = service_info.address
-    if TD_MANUFACTURER_ID not in manufacturer_data or manufacturer_data[TD_MANUFACTURER_ID] != TD_MANUFACTURER_SERIAL:
+    # TD devices advertise just the serial marker, so one lookup is enough
+    if manufacturer_data.get(TD_MANUFACTURER_ID) != TD_MANUFACTURER_SERIAL:
         _LOGGER.debug("Unsupported device '%s' manufacturer data: %s", service_info.name, manufacturer_data)
         return False
 
@@ -64,7 +64,9 @@ class TDConfigFlow(ConfigFlow, domain=DOMAIN):
         """Initialize the config flow."""
         self._discovery_info: BluetoothServiceInfoBleak | None = None
         self._discovered_device: TDBluetoothDeviceData | None = None
-        self._discovered_devices: dict[str, str] = {}
+        self._discovered_devices: dict[str, Discovery] = {}
+        # The device data is reused between the probes of the flow
+        self._td = TDBluetoothDeviceData()
 
     async def _get_device_data(
         self, discovery_info: BluetoothServiceInfo
@@ -76,10 +78,8 @@ class TDConfigFlow(ConfigFlow, domain=DOMAIN):
             _LOGGER.debug("No ble_device in _get_device_data")
             raise TDDeviceUpdateError("No ble_device")
 
-        td = TDBluetoothDeviceData()
-
         try:
-            data = await td.update_device(ble_device)
+            data = await self._td.update_device(ble_device)
         except BleakError as err:
             _LOGGER.error("Error connecting to and getting data from %s: %s", discovery_info.address, err)
             raise TDDeviceUpdateError("Failed getting device data") from err
@@ -135,15 +135,26 @@ class TDConfigFlow(ConfigFlow, domain=DOMAIN):
             address = user_input[CONF_ADDRESS]
             await self.async_set_unique_id(address, raise_on_progress=False)
             self._abort_if_unique_id_configured()
-            discovery = self._discovered_devices[address]
+            discovery_info = self._discovered_devices[address].discovery_info
+
+            # Connect only to the device picked by the user
+            try:
+                device = await self._get_device_data(discovery_info)
+            except TDDeviceUpdateError as e:
+                _LOGGER.error("Unable to connect to device: %s", e)
+                return self.async_abort(reason="cannot_connect")
+            except Exception as e:
+                _LOGGER.error("Unable to get device data: %s", e)
+                return self.async_abort(reason="unknown")
+            name = get_name(device)
 
             self.context["title_placeholders"] = {
-                "name": discovery.name,
+                "name": name,
             }
 
-            self._discovered_device = discovery
+            self._discovered_device = Discovery(name, discovery_info, device)
 
-            return self.async_create_entry(title=discovery.name, data={})
+            return self.async_create_entry(title=name, data={})
 
         current_addresses = self._async_current_ids()
         servinfo = async_discovered_service_info(self.hass)
@@ -155,24 +166,15 @@ class TDConfigFlow(ConfigFlow, domain=DOMAIN):
             if not is_device_supported(discovery_info):
                 continue
 
-            try:
-                device = await self._get_device_data(discovery_info)
-            except TDDeviceUpdateError as e:
-                _LOGGER.error("Unable to connect to device: %s", e)
-                return self.async_abort(reason="cannot_connect")
-            except Exception as e:
-                _LOGGER.error("Unable to get device data: %s", e)
-                return self.async_abort(reason="unknown")
-            name = get_name(device)
-            self._discovered_devices[address] = Discovery(name, discovery_info, device)
+            # The advertised name is enough to pick the device from the list
+            self._discovered_devices[address] = Discovery(discovery_info.name, discovery_info, None)
 
         if not self._discovered_devices:
-            for discovery_info in servinfo:
-                _LOGGER.warning("No supported devices located: Unsupported device '%s' manufacturer data: %s", discovery_info.name, discovery_info.manufacturer_data)
+            _LOGGER.warning("No supported devices located among %d discovered devices", len(servinfo))
             return self.async_abort(reason="no_devices_found")
 
         titles = { address:
-            discovery.device.name for (address, discovery) in self._discovered_devices.items()
+            f"{discovery.name} ({address})" for (address, discovery) in self._discovered_devices.items()
         }
         return self.async_show_form(
             step_id="user",
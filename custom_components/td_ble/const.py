@@ -1,7 +1,16 @@
 """Constants for Transducers Direct BLE"""
 
+from typing import Final
+
 DOMAIN = "td_ble"
 MANUFACTURER = "Transducers Direct"
 
 MAX_RETRIES_AFTER_STARTUP = 5
 DEFAULT_SCAN_INTERVAL = 300
+
+# Sensors reported by the device, the signal strength comes from advertisements
+DEVICE_SENSORS: Final = frozenset(("temperature", "pressure", "maxpressure", "battery"))
+SIGNAL_STRENGTH_SENSOR: Final = "signal_strength"
+# Seconds the advertised signal strength is current, the device usually
+# stops advertising while connected
+SIGNAL_STRENGTH_MAX_AGE = 60
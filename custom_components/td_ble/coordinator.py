@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import timedelta
 import logging
+import time
 
 from .tdlib import TDBluetoothDeviceData, TDDevice
 from bleak.backends.device import BLEDevice
@@ -9,12 +10,18 @@ from bleak_retry_connector import close_stale_connections_by_address
 
 from homeassistant.components import bluetooth
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import CONNECTION_BLUETOOTH
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from homeassistant.util.unit_system import METRIC_SYSTEM
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SIGNAL_STRENGTH_MAX_AGE,
+    SIGNAL_STRENGTH_SENSOR,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,13 +31,19 @@ type TDBLEConfigEntry = ConfigEntry[TDBLEDataUpdateCoordinator]
 class TDBLEDataUpdateCoordinator(DataUpdateCoordinator[TDDevice]):
     """Class to manage fetching TD BLE data."""
 
-    ble_device: BLEDevice
     config_entry: TDBLEConfigEntry
 
-    def __init__(self, hass: HomeAssistant, entry: TDBLEConfigEntry) -> None:
+    def __init__(self, hass: HomeAssistant, entry: TDBLEConfigEntry, is_metric: bool) -> None:
         """Initialize the coordinator."""
         _LOGGER.debug("Init coordinator")
-        self.td = TDBluetoothDeviceData(hass.config.units is METRIC_SYSTEM, persistent=True)
+        self.is_metric = is_metric
+        self.td = TDBluetoothDeviceData(is_metric, persistent=True)
+        self.td.set_update_callback(self._async_handle_notification)
+        self._rssi: int | None = None
+        self._rssi_time = 0.0
+        self.ble_device: BLEDevice | None = None
+        self._fw_version: str | None = None
+        self.platforms_forwarded = False
         try:
             super().__init__(
                 hass,
@@ -61,28 +74,81 @@ class TDBLEDataUpdateCoordinator(DataUpdateCoordinator[TDDevice]):
         ble_device = bluetooth.async_ble_device_from_address(self.hass, address)
 
         if not ble_device:
-            _LOGGER.error(f"Could not find TD device with address {address}")
+            _LOGGER.error("Could not find TD device with address %s", address)
             raise ConfigEntryNotReady(f"Could not find TD device with address {address}")
 
         self.ble_device = ble_device
 
+        # Advertisements are received passively, so keeping track of them costs
+        # no radio time and saves a lookup in the bluetooth manager per poll.
+        self.config_entry.async_on_unload(
+            bluetooth.async_register_callback(
+                self.hass,
+                self._async_handle_bluetooth_event,
+                bluetooth.BluetoothCallbackMatcher(address=address),
+                bluetooth.BluetoothScanningMode.PASSIVE,
+            )
+        )
+
+    @callback
+    def _async_handle_bluetooth_event(
+        self,
+        service_info: bluetooth.BluetoothServiceInfoBleak,
+        change: bluetooth.BluetoothChange,
+    ) -> None:
+        """Update the device from a received advertisement."""
+        self.ble_device = service_info.device
+        # The advertisement carries no measurements, only the signal strength.
+        # It changes with almost every advertisement, so it is published with
+        # the next poll or notification instead of updating the entities here.
+        self._rssi = service_info.rssi
+        self._rssi_time = service_info.time
+
+    @callback
+    def _async_handle_notification(self, data: TDDevice) -> None:
+        """Update the data pushed by the device."""
+        # Unlike async_set_updated_data this keeps the poll schedule, which still
+        # reads the sensors without notifications and checks the connection.
+        self.data = self._add_signal_strength(data)
+        self.async_update_listeners()
+
+    def _add_signal_strength(self, data: TDDevice) -> TDDevice:
+        """Add the signal strength of a recent advertisement to the device data."""
+        # The advertisement time is monotonic as well
+        if self._rssi is not None and time.monotonic() - self._rssi_time <= SIGNAL_STRENGTH_MAX_AGE:
+            data.sensors[SIGNAL_STRENGTH_SENSOR] = self._rssi
+        else:
+            # Don't report the last value as current, the sensor is unavailable instead
+            data.sensors.pop(SIGNAL_STRENGTH_SENSOR, None)
+        return data
+
     async def _async_update_data(self) -> TDDevice:
         """Get data from TD BLE."""
         _LOGGER.debug("Executing Coordinator._async_update_data")
-        if getattr(self, "ble_device", None) is None:
+        if self.ble_device is None:
             address = self.config_entry.unique_id
             self.ble_device = bluetooth.async_ble_device_from_address(self.hass, address)
         try:
             data = await self.td.update_device(self.ble_device)
         except Exception as err:
-            _LOGGER.error(f"Unable to fetch data: {err}")
+            _LOGGER.error("Unable to fetch data: %s", err)
             raise UpdateFailed(f"Unable to fetch data: {err}") from err
 
-        return data
+        if data.fw_version != self._fw_version:
+            self._async_update_sw_version(data)
+
+        return self._add_signal_strength(data)
 
-    async def disconnect(self):
-        if self.td == None:
-            _LOGGER.error("Device has no connection")
-            return
+    @callback
+    def _async_update_sw_version(self, data: TDDevice) -> None:
+        """Show the firmware version checked after a reconnect on the device."""
+        self._fw_version = data.fw_version
+        # The entities set the device info just when created
+        dev_reg = dr.async_get(self.hass)
+        device = dev_reg.async_get_device(connections={(CONNECTION_BLUETOOTH, data.address)})
+        if device is not None and device.sw_version != data.fw_version:
+            dev_reg.async_update_device(device.id, sw_version=data.fw_version)
 
+    async def disconnect(self) -> None:
+        """Close the persistent connection to the device."""
         await self.td.disconnect()
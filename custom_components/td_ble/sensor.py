@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from typing import Final
 
 from .tdlib import TDDevice
 
@@ -30,15 +31,14 @@ from homeassistant.helpers.entity_registry import (
 )
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-from homeassistant.util.unit_system import METRIC_SYSTEM
 
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_STRENGTH_SENSOR
 from .coordinator import TDBLEConfigEntry, TDBLEDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
 
-SENSORS_MAPPING_TEMPLATE: dict[str, SensorEntityDescription] = {
+SENSORS_MAPPING_TEMPLATE: Final[dict[str, SensorEntityDescription]] = {
     "temperature": SensorEntityDescription(
         key="temperature",
         device_class=SensorDeviceClass.TEMPERATURE,
@@ -57,8 +57,8 @@ SENSORS_MAPPING_TEMPLATE: dict[str, SensorEntityDescription] = {
         native_unit_of_measurement=UnitOfPressure.PSI,
         state_class=SensorStateClass.MEASUREMENT,
     ),
-    "signal_strength": SensorEntityDescription(
-        key="signal_strength",
+    SIGNAL_STRENGTH_SENSOR: SensorEntityDescription(
+        key=SIGNAL_STRENGTH_SENSOR,
         device_class=SensorDeviceClass.SIGNAL_STRENGTH,
         native_unit_of_measurement=SIGNAL_STRENGTH_DECIBELS_MILLIWATT,
         state_class=SensorStateClass.MEASUREMENT,
@@ -76,14 +76,15 @@ SENSORS_MAPPING_TEMPLATE: dict[str, SensorEntityDescription] = {
 
 
 @callback
-def async_migrate(hass: HomeAssistant, address: str, sensor_name: str) -> None:
+def async_migrate(hass: HomeAssistant, td_device: TDDevice, sensor_name: str) -> None:
     """Migrate entities to new unique ids (with BLE Address)."""
     _LOGGER.debug("Migrating sensor '%s'", sensor_name)
     ent_reg = er.async_get(hass)
+    address = td_device.address
     unique_id_trailer = f"_{sensor_name}"
     new_unique_id = f"{address}{unique_id_trailer}"
 
-    if ent_reg.async_get_entity_id(DOMAIN, Platform.SENSOR, new_unique_id):
+    if ent_reg.async_get_entity_id(Platform.SENSOR, DOMAIN, new_unique_id):
         # New unique id already exists
         return
 
@@ -92,19 +93,36 @@ def async_migrate(hass: HomeAssistant, address: str, sensor_name: str) -> None:
     if not (device := dev_reg.async_get_device(connections={(CONNECTION_BLUETOOTH, address)})):
         return
 
-    entities = async_entries_for_device(ent_reg, device_id=device.id, include_disabled_entities=True)
-    matching_reg_entry: RegistryEntry | None = None
+    # Look for the known legacy unique ids first, preferring the one without identifier.
+    # Devices with the same fallback name share them, so only take the ones of this device.
+    entity_id: str | None = None
+    for legacy_unique_id in (
+        f"{td_device.name}{unique_id_trailer}",
+        f"{td_device.name} ({td_device.identifier}){unique_id_trailer}",
+    ):
+        if (
+            (legacy_entity_id := ent_reg.async_get_entity_id(Platform.SENSOR, DOMAIN, legacy_unique_id))
+            and (legacy_entry := ent_reg.async_get(legacy_entity_id))
+            and legacy_entry.device_id == device.id
+        ):
+            entity_id = legacy_entity_id
+            break
+
+    if entity_id is None:
+        entities = async_entries_for_device(ent_reg, device_id=device.id, include_disabled_entities=True)
+        matching_reg_entry: RegistryEntry | None = None
+
+        for entry in entities:
+            if entry.unique_id.endswith(unique_id_trailer) and \
+                    (not matching_reg_entry or "(" not in entry.unique_id):
+                matching_reg_entry = entry
+
+        if not matching_reg_entry or matching_reg_entry.unique_id == new_unique_id:
+            # Already has the newest unique id format
+            return
+
+        entity_id = matching_reg_entry.entity_id
 
-    for entry in entities:
-        if entry.unique_id.endswith(unique_id_trailer) and \
-                (not matching_reg_entry or "(" not in entry.unique_id):
-            matching_reg_entry = entry
-
-    if not matching_reg_entry or matching_reg_entry.unique_id == new_unique_id:
-        # Already has the newest unique id format
-        return
-
-    entity_id = matching_reg_entry.entity_id
     ent_reg.async_update_entity(entity_id=entity_id, new_unique_id=new_unique_id)
 
     _LOGGER.debug("Migrated entity '%s' to unique id '%s'", entity_id, new_unique_id)
@@ -117,22 +135,23 @@ async def async_setup_entry(
 ) -> None:
     """Set up the TD BLE sensors."""
     _LOGGER.debug("Setup entity")
-    is_metric = hass.config.units is METRIC_SYSTEM
-
     coordinator = entry.runtime_data
+    is_metric = coordinator.is_metric
 
+    # The template is not changed, so it is used directly
+    sensors_mapping = SENSORS_MAPPING_TEMPLATE
     # we need to change some units
-    sensors_mapping = SENSORS_MAPPING_TEMPLATE.copy()
     #if not is_metric:
+    #    sensors_mapping = SENSORS_MAPPING_TEMPLATE.copy()
     #    for key, val in sensors_mapping.items():
 
     entities = []
-    _LOGGER.debug("got sensors: %s", coordinator.data.sensors)
-    for sensor_type, sensor_value in coordinator.data.sensors.items():
-        if sensor_type not in sensors_mapping:
-            _LOGGER.debug("Unknown sensor type detected: %s, %s", sensor_type, sensor_value)
-            continue
-        async_migrate(hass, coordinator.data.address, sensor_type)
+    sensors = coordinator.data.sensors
+    _LOGGER.debug("got sensors: %s", sensors)
+    if unknown_sensor_types := sensors.keys() - sensors_mapping.keys():
+        _LOGGER.debug("Unknown sensor types detected: %s", unknown_sensor_types)
+    for sensor_type in sensors.keys() & sensors_mapping.keys():
+        async_migrate(hass, coordinator.data, sensor_type)
         entities.append(TDSensor(coordinator, coordinator.data, sensors_mapping[sensor_type]))
 
     async_add_entities(entities)
@@ -154,6 +173,8 @@ class TDSensor(
         """Populate the TD entity with relevant data."""
         super().__init__(coordinator)
         self.entity_description = entity_description
+        # Read on every state update, so keep it at hand
+        self._sensor_key = entity_description.key
 
         name = td_device.name
         if (identifier := td_device.identifier) in name:
@@ -173,9 +194,9 @@ class TDSensor(
     @property
     def available(self) -> bool:
         """Check if device and sensor is available in data."""
-        return (super().available and self.entity_description.key in self.coordinator.data.sensors)
+        return (super().available and self._sensor_key in self.coordinator.data.sensors)
 
     @property
     def native_value(self) -> StateType:
         """Return the value reported by the sensor."""
-        return self.coordinator.data.sensors[self.entity_description.key]
+        return self.coordinator.data.sensors[self._sensor_key]
@@ -9,24 +9,10 @@ class TDDeviceType(Enum):
     UNKNOWN = 0
     PRESSURE_LCR03F = "TDWLB-LCR03F"
 
-    raw_value: str
-
-    def __new__(cls, value: str) -> "TDDeviceType":
-        """Create new device type."""
-        obj = object.__new__(cls)
-        obj.raw_value = value
-        return obj
-
     @classmethod
     def from_raw_value(cls, value: str) -> "TDDeviceType":
         """Get device type from raw value."""
-        for device_type in cls:
-            if device_type.value == value:
-                device_type.raw_value = value
-                return device_type
-        unknown_device = TDDeviceType.UNKNOWN
-        unknown_device.raw_value = value
-        return unknown_device
+        return _DEVICE_TYPES_BY_VALUE.get(value, TDDeviceType.UNKNOWN)
 
     @property
     def product_name(self) -> str:
@@ -34,3 +20,10 @@ class TDDeviceType(Enum):
         if self == TDDeviceType.PRESSURE_LCR03F:
             return "Pressure LCR03F"
         return "Unknown"
+
+
+_DEVICE_TYPES_BY_VALUE: dict[str, TDDeviceType] = {
+    device_type.value: device_type
+    for device_type in TDDeviceType
+    if device_type is not TDDeviceType.UNKNOWN
+}
@@ -10,10 +10,11 @@ import asyncio
 import dataclasses
 from collections import namedtuple
 from functools import partial
-from typing import Callable, Optional
+from typing import Callable
 
 from async_interrupt import interrupt
 from bleak import BleakClient, BleakError
+from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.backends.device import BLEDevice
 from bleak_retry_connector import BleakClientWithServiceCache, establish_connection
 from bleak_retry_connector import close_stale_connections_by_address
@@ -51,6 +52,11 @@ _LOGGER = logging.getLogger(__name__)
 class DisconnectedError(Exception):
     """Disconnected from device."""
 
+
+def _is_not_found(err: BleakError) -> bool:
+    """Check the error reports a characteristic missing from the cached services."""
+    return "not found" in str(err)  # In future bleak this is a named exception
+
 Characteristic = namedtuple("Characteristic", ["uuid", "name", "format"])
 device_info_characteristics = [
     Characteristic(CHAR_MANUFACTURER, "manufacturer", "utf-8"),
@@ -58,95 +64,90 @@ device_info_characteristics = [
     Characteristic(CHAR_DEVICE_NAME, "device_name", "utf-8"),
     Characteristic(CHAR_FIRMWARE_REV, "firmware_rev", "utf-8"),
 ]
+# Device info attribute receiving the value of the characteristic
+_DEVICE_INFO_ATTRS = {
+    "manufacturer": "manufacturer",
+    "serial_nr": "identifier",
+    "device_name": "name",
+    "firmware_rev": "fw_version",
+}
+
+_unpack_int8 = struct.Struct("b").unpack
+_unpack_int16_be = struct.Struct(">h").unpack
 
-def _decode_attr(
-    name: str, format_type: str, scale: float, max_value: Optional[float] = None
-) -> Callable[[bytearray], dict[str, float | None | str]]:
-    """same as base decoder, but expects only one value.. for real"""
-
-    def handler(raw_data: bytearray) -> dict[str, float | None | str]:
-        val = struct.unpack(format_type, raw_data)
-        res: float | None = None
-        if len(val) == 1:
-            res = val[0] * scale
-        if res is not None and max_value is not None:
-            # Verify that the result is not above the maximum allowed value
-            if res > max_value:
-                res = None
-        data: dict[str, float | None | str] = {name: res}
 
+def _decode_pressure(raw_data: bytearray) -> dict[str, float | None | str]:
+    """Decode the pressure in 0.1 psi."""
+    res = _unpack_int16_be(raw_data)[0] * 0.1
+    if _LOGGER.isEnabledFor(logging.DEBUG):
         _LOGGER.debug("Parsed raw data: 0x%s : %s", raw_data.hex(), res)
+    return {"pressure": res}
 
-        return data
 
-    return handler
+def _decode_maxpressure(raw_data: bytearray) -> dict[str, float | None | str]:
+    """Decode the max pressure in 0.1 psi."""
+    res = _unpack_int16_be(raw_data)[0] * 0.1
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Parsed raw data: 0x%s : %s", raw_data.hex(), res)
+    return {"maxpressure": res}
+
+
+def _decode_temperature(raw_data: bytearray) -> dict[str, float | None | str]:
+    """Decode the temperature in 0.01 degrees Celsius."""
+    res = _unpack_int16_be(raw_data)[0] * 0.01
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Parsed raw data: 0x%s : %s", raw_data.hex(), res)
+    return {"temperature": res}
+
+
+def _decode_battery(raw_data: bytearray) -> dict[str, float | None | str]:
+    """Decode the battery level in percent."""
+    res = _unpack_int8(raw_data)[0]
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug("Parsed raw data: 0x%s : %s", raw_data.hex(), res)
+    return {"battery": res}
+
 
 sensor_decoders: dict[
     str,
     Callable[[bytearray], dict[str, float | None | str]],
 ] = {
-    CHAR_PRESSURE: _decode_attr(name="pressure", format_type=">h", scale=1.0 / 10.0),
-    CHAR_MAXPRESSURE: _decode_attr(name="maxpressure", format_type=">h", scale=1.0 / 10.0),
-    CHAR_TEMPERATURE: _decode_attr(name="temperature", format_type=">h", scale=1.0 / 100.0),
-    CHAR_BATTERY: _decode_attr(name="battery", format_type="b", scale=1),
+    CHAR_PRESSURE: _decode_pressure,
+    CHAR_MAXPRESSURE: _decode_maxpressure,
+    CHAR_TEMPERATURE: _decode_temperature,
+    CHAR_BATTERY: _decode_battery,
 }
 
-sensors_characteristics = [
+sensors_characteristics = frozenset((
     CHAR_TEMPERATURE,
     CHAR_BATTERY,
     CHAR_PRESSURE,
     CHAR_MAXPRESSURE,
-]
+))
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class TDDeviceInfo:
     """Response data with information about the TD device without sensors."""
 
     manufacturer: str = ""
     fw_version: str = ""
     model: TDDeviceType = TDDeviceType.UNKNOWN
+    model_number: str = ""
     name: str = ""
     identifier: str = ""
     address: str = ""
     did_first_sync: bool = False
 
-    sensor_decoders = None
-
-    def __init__(self):
-        self.sensor_decoders = {
-            CHAR_PRESSURE: self._decode_attr(name="pressure", format_type=">h", scale=1.0 / 10.0),
-            CHAR_MAXPRESSURE: self._decode_attr(name="maxpressure", format_type=">h", scale=1.0 / 10.0),
-            CHAR_TEMPERATURE: self._decode_attr(name="temperature", format_type=">h", scale=1.0 / 100.0),
-            CHAR_BATTERY: self._decode_attr(name="battery", format_type="b", scale=1),
-        }
-
-    def _decode_attr(
-        self, name: str, format_type: str, scale: float, max_value: Optional[float] = None
-    ) -> Callable[[bytearray], dict[str, float | None | str]]:
-        def handler(_, raw_data: bytearray) -> None:
-            val = struct.unpack(format_type, raw_data)
-            res: float | None = None
-            if len(val) == 1:
-                res = val[0] * scale
-            if res is not None and max_value is not None:
-                # Verify that the result is not above the maximum allowed value
-                if res > max_value:
-                    res = None
-            data: dict[str, float | None | str] = {name: res}
-
-            _LOGGER.debug("Parsed raw data: 0x%s : %s", raw_data.hex(), res)
-
-            self.sensors.update(data)
-
-        return handler
-
     def friendly_name(self) -> str:
         """Generate a name for the device."""
 
         return f"TD {self.model.product_name}"
 
 
-@dataclasses.dataclass
+_DEVICE_INFO_FIELD_NAMES: tuple[str, ...] = tuple(field.name for field in dataclasses.fields(TDDeviceInfo))
+
+
+@dataclasses.dataclass(slots=True)
 class TDDevice(TDDeviceInfo):
     """Response data with information about the TD device"""
 
@@ -172,22 +173,54 @@ class TDBluetoothDeviceData:
         # For persistent connection
         self._persistent = persistent
         self._client = None
+        # Set by disconnect(), no connection is established afterwards
+        self._closed = False
+        self._disconnect_future: asyncio.Future[bool] | None = None
+        self._check_fw_version = False
         self._device = None
+        # Characteristics resolved from the services of the current client
+        self._chars: dict[str, BleakGATTCharacteristic] | None = None
+        self._sensor_chars: dict[str, BleakGATTCharacteristic] | None = None
+        # Sensor characteristics the device pushes with notifications
+        self._notify_chars: set[str] = set()
+        self._update_callback: Callable[[TDDevice], None] | None = None
+        # Only one update talks to the device at a time
+        self._update_lock = asyncio.Lock()
 
     def set_max_attempts(self, max_attempts: int) -> None:
         """Set the number of attempts."""
         self.max_attempts = max_attempts
 
+    def set_update_callback(self, update_callback: Callable[[TDDevice], None] | None) -> None:
+        """Set the callback receiving the data pushed by the device."""
+        self._update_callback = update_callback
+
     @property
     def is_connected(self) -> bool:
         return self._client != None and self._client.is_connected
 
-    async def disconnect(self):
-        if self.is_connected:
-            _LOGGER.info("Disconnecting from device")
-            await self._client.disconnect()
-            self._client = None
-        _LOGGER.error("Device has no connection")
+    async def disconnect(self) -> None:
+        """Close the connection to the device for good, also stopping a running update."""
+        self._closed = True
+        await self._disconnect()
+
+    async def _disconnect(self, stop_notify: bool = True) -> None:
+        """Close the connection to the device, unsubscribing the notifications if asked."""
+        client, self._client = self._client, None
+        notify_chars = [self._sensor_chars[uuid_str] for uuid_str in self._notify_chars]
+        self._chars = None
+        self._sensor_chars = None
+        self._notify_chars.clear()
+        if client is None or not client.is_connected:
+            _LOGGER.debug("Device has no connection")
+            return
+        for characteristic in notify_chars if stop_notify else ():
+            try:
+                await client.stop_notify(characteristic)
+            except BleakError as err:
+                _LOGGER.debug("Stop notifications exception: %s", err)
+        _LOGGER.debug("Disconnecting from %s", client.address)
+        await client.disconnect()
 
     async def _get_device_characteristics(self) -> None:
         _LOGGER.debug("Executing TDBluetoothDeviceData._get_device_characteristics")
@@ -196,88 +229,151 @@ class TDBluetoothDeviceData:
         device_info.address = self._client.address
         did_first_sync = device_info.did_first_sync
 
-        # We need to fetch model to determ what to fetch.
-        if not did_first_sync:
+        if self._check_fw_version:
+            # Only the fw_version can change once set, but just with an update while
+            # the device is disconnected, so it is checked once per connection.
             try:
-                data = await self._client.read_gatt_char(CHAR_MODEL_NUMBER)
+                data = await self._client.read_gatt_char(self._get_characteristic(CHAR_FIRMWARE_REV))
             except BleakError as err:
                 _LOGGER.debug("Get device characteristics exception: %s", err)
+            else:
+                self._check_fw_version = False
+                fw_version = data.decode("utf-8")
+                if fw_version != device_info.fw_version:
+                    _LOGGER.info("Firmware version of %s changed to %s", device_info.address, fw_version)
+                    device_info.fw_version = device.fw_version = fw_version
+
+        # Only the fw_version can change once set, so we can skip the rest.
+        info_results: list[bytearray | BleakError] = []
+        if not did_first_sync:
+            # The model is read together with the rest of the device information
+            data, *info_results = await self._read_characteristics([
+                self._get_characteristic(uuid)
+                for uuid in (CHAR_MODEL_NUMBER, *(char.uuid for char in device_info_characteristics))
+            ])
+
+            # We need the model to know what device it is.
+            if isinstance(data, BleakError):
+                if _is_not_found(data):
+                    # Stale services cache, let the update clear it and reconnect
+                    raise data
+                _LOGGER.debug("Get device characteristics exception: %s", data)
                 return
 
-            device_info.model = TDDeviceType.from_raw_value(data.decode("utf-8").strip())
-            if device_info.model == TDDeviceType.UNKNOWN:
-                _LOGGER.warning("Could not map model number to model name, most likely an unsupported device: %s", data.decode("utf-8"))
+            device_info.model_number = data.decode("utf-8").strip()
+            device_info.model = TDDeviceType.from_raw_value(device_info.model_number)
+            if device_info.model is TDDeviceType.UNKNOWN:
+                _LOGGER.warning("Could not map model number to model name, most likely an unsupported device: %s", device_info.model_number)
 
-        for characteristic in device_info_characteristics:
-            # Only the fw_version can change once set, so we can skip the rest.
-            if did_first_sync: # and characteristic.name != "firmware_rev":
+        for characteristic, data in zip(device_info_characteristics, info_results):
+            # The rest of the device information is optional, BlueZ for example
+            # does not expose the device name, so a missing one is not an error.
+            if isinstance(data, BleakError):
+                _LOGGER.debug("Get device characteristics exception: %s", data)
                 continue
-
-            try:
-                data = await self._client.read_gatt_char(characteristic.uuid)
-            except BleakError as err:
-                _LOGGER.debug("Get device characteristics exception: %s", err)
-                continue
-            if characteristic.name == "manufacturer":
-                device_info.manufacturer = data.decode(characteristic.format)
-            elif characteristic.name == "firmware_rev":
-                device_info.fw_version = data.decode(characteristic.format)
-            elif characteristic.name == "device_name":
-                device_info.name = data.decode(characteristic.format)
-            elif characteristic.name == "serial_nr":
-                identifier = data.decode(characteristic.format)
-                # Some devices return `Serial Number` on Mac instead of
-                # the actual serial number.
-                if identifier != "Serial Number":
-                    device_info.identifier = identifier
-            else:
+            attr = _DEVICE_INFO_ATTRS.get(characteristic.name)
+            if attr is None:
                 _LOGGER.debug("Characteristics not handled: %s %s", characteristic.name, characteristic.uuid)
+                continue
+            value = data.decode(characteristic.format)
+            # Some devices return `Serial Number` on Mac instead of
+            # the actual serial number.
+            if attr == "identifier" and value == "Serial Number":
+                continue
+            setattr(device_info, attr, value)
 
         # In some cases the device name will be empty, for example when using a Mac.
-        if not device_info.name:
+        # The name is not read again after the first sync, so set it just once.
+        if not did_first_sync and not device_info.name:
             device_info.name = device_info.friendly_name()
 
         if device_info.model:
             device_info.did_first_sync = True
 
-        # Copy the cached device_info to device
-        for field in dataclasses.fields(device_info):
-            name = field.name
-            setattr(device, name, getattr(device_info, name))
+        # Copy the cached device_info to device, it stays the same after the first sync
+        if not did_first_sync:
+            for name in _DEVICE_INFO_FIELD_NAMES:
+                setattr(device, name, getattr(device_info, name))
+
+    async def _read_characteristics(
+        self, characteristics: list[BleakGATTCharacteristic | str]
+    ) -> list[bytearray | BleakError]:
+        """Read the characteristics concurrently, returning the read errors in place of data."""
+        results = await asyncio.gather(
+            *(self._client.read_gatt_char(char) for char in characteristics),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, BleakError):
+                raise result
+        return results
+
+    def _get_characteristic(self, uuid: str) -> BleakGATTCharacteristic | str:
+        """Get the characteristic object, so bleak does not need to look it up by UUID."""
+        if self._chars is None:
+            # The services do not change during the connection, so walk them only once
+            self._chars = {
+                str(characteristic.uuid): characteristic
+                for service in self._client.services
+                for characteristic in service.characteristics
+            }
+        # Unresolved UUID will be reported by bleak as not found
+        return self._chars.get(uuid, uuid)
+
+    def _resolve_sensor_characteristics(self) -> dict[str, BleakGATTCharacteristic]:
+        """Find the sensor characteristics in the services of the connected device."""
+        sensor_chars = {}
+        for uuid_str in sensors_characteristics:
+            characteristic = self._get_characteristic(uuid_str)
+            # Every sensor characteristic has a decoder, so no need to check it
+            if isinstance(characteristic, BleakGATTCharacteristic):
+                sensor_chars[uuid_str] = characteristic
+        return sensor_chars
 
     async def _get_service_characteristics(self) -> None:
         _LOGGER.debug("Executing TDBluetoothDeviceData._get_service_characteristics")
-        svcs = self._client.services
-        sensors = self._device.sensors
-        for service in svcs:
-            for characteristic in service.characteristics:
-                uuid_str = str(characteristic.uuid)
-
-                if uuid_str in sensors_characteristics and uuid_str in sensor_decoders:
-                    _LOGGER.debug("Updating characteristic %s: %s", uuid_str, characteristic)
-                    try:
-                        data = await self._client.read_gatt_char(characteristic)
-                    except BleakError as err:
-                        _LOGGER.debug("Get service characteristics exception: %s", err)
-                        continue
-
-                    self._device.sensors.update(sensor_decoders[uuid_str](data))
-
-#   async def _setup_notifications() -> None:
-#       _LOGGER.debug("Executing TDBluetoothDeviceData._setup_notifications")
-#       svcs = self._client.services
-#       sensors = self._device.sensors
-#       for service in svcs:
-#           for characteristic in service.characteristics:
-#               uuid_str = str(characteristic.uuid)
-
-#               if uuid_str in sensors_characteristics and uuid_str in self._device.sensor_decoders:
-#                   _LOGGER.debug("Setup characteristic notifications %s: %s", uuid_str, characteristic)
-#                   try:
-#                       await self._client.start_notify(uuid_str, self._device.sensor_decoders[uuid_str])
-#                   except BleakError as err:
-#                       _LOGGER.warning("Setup notifications exception: %s", err)
-#                       continue
+        if self._sensor_chars is None:
+            self._sensor_chars = self._resolve_sensor_characteristics()
+
+        targets = []
+        for uuid_str, characteristic in self._sensor_chars.items():
+            if uuid_str in self._notify_chars:
+                # The device pushes the value by itself
+                continue
+            _LOGGER.debug("Updating characteristic %s: %s", uuid_str, characteristic)
+            targets.append((uuid_str, characteristic))
+
+        results = await self._read_characteristics([char for _, char in targets])
+        for (uuid_str, _), data in zip(targets, results):
+            if isinstance(data, BleakError):
+                if _is_not_found(data):
+                    # The resolved characteristic is gone, so the services cache is stale
+                    raise data
+                _LOGGER.debug("Get service characteristics exception: %s", data)
+                continue
+
+            self._device.sensors.update(sensor_decoders[uuid_str](data))
+
+    async def _setup_notifications(self) -> None:
+        _LOGGER.debug("Executing TDBluetoothDeviceData._setup_notifications")
+        for uuid_str, characteristic in self._sensor_chars.items():
+            if uuid_str in self._notify_chars or "notify" not in characteristic.properties:
+                continue
+            _LOGGER.debug("Setup characteristic notifications %s: %s", uuid_str, characteristic)
+            try:
+                await self._client.start_notify(characteristic, self._handle_notification)
+            except BleakError as err:
+                if _is_not_found(err):
+                    raise
+                _LOGGER.warning("Setup notifications exception: %s", err)
+                continue
+            self._notify_chars.add(uuid_str)
+
+    def _handle_notification(self, characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Handle sensor data pushed by the device."""
+        self._device.sensors.update(sensor_decoders[str(characteristic.uuid)](data))
+        if self._update_callback is not None:
+            self._update_callback(self._device)
 
     def _handle_disconnect(
         self, disconnect_future: asyncio.Future[bool], client: BleakClient
@@ -289,30 +385,48 @@ class TDBluetoothDeviceData:
 
     async def update_device(self, ble_device: BLEDevice) -> TDDevice:
         """Connects to the device through BLE and retrieves relevant data"""
-        # We don't need to poll if the connection is established
-        for attempt in range(self.max_attempts):
-            _LOGGER.debug("Updating %s (attempt %d)", ble_device.address, attempt)
-            is_final_attempt = attempt == self.max_attempts - 1
-            try:
-                return await self._update_device(ble_device)
-            except DisconnectedError:
-                if is_final_attempt:
-                    raise
-                _LOGGER.debug("Unexpectedly disconnected from %s", ble_device.address)
-            except BleakError as err:
-                if is_final_attempt:
-                    raise
-                _LOGGER.debug("Bleak error: %s", err)
+        if (
+            self._update_lock.locked()
+            and self._device is not None
+            and self.device_info.did_first_sync
+            and self.device_info.address == ble_device.address
+        ):
+            # The running update will refresh the data, no need to wait for another one
+            _LOGGER.debug("Update of %s is in progress, using the last data", ble_device.address)
+            return self._device
+
+        async with self._update_lock:
+            # We don't need to poll if the connection is established
+            for attempt in range(self.max_attempts):
+                if self._closed:
+                    raise DisconnectedError(f"Connection to {ble_device.address} is closed")
+                _LOGGER.debug("Updating %s (attempt %d)", ble_device.address, attempt)
+                is_final_attempt = attempt == self.max_attempts - 1
+                try:
+                    return await self._update_device(ble_device)
+                except DisconnectedError:
+                    if is_final_attempt:
+                        raise
+                    _LOGGER.debug("Unexpectedly disconnected from %s", ble_device.address)
+                except BleakError as err:
+                    if is_final_attempt:
+                        raise
+                    _LOGGER.debug("Bleak error: %s", err)
         raise RuntimeError("Should not reach this point")
 
     async def _update_device(self, ble_device: BLEDevice) -> TDDevice:
         """Connects to the device through BLE and retrieves relevant data"""
+        if self.device_info.address not in ("", ble_device.address):
+            # The data object is reused for another device, so start over
+            await self._disconnect()
+            self.device_info = TDDeviceInfo()
+            self._device = None
         if self._device is None:
             self._device = TDDevice()
-        loop = asyncio.get_running_loop()
-        disconnect_future = loop.create_future()
         if not self.is_connected:
             await close_stale_connections_by_address(ble_device.address)
+            # The disconnect future lives as long as the connection
+            self._disconnect_future = disconnect_future = asyncio.get_running_loop().create_future()
             self._client = (
                 await establish_connection(
                     BleakClientWithServiceCache,
@@ -321,28 +435,42 @@ class TDBluetoothDeviceData:
                     disconnected_callback=partial(
                         self._handle_disconnect, disconnect_future
                     ),
+                    use_services_cache=True,
                 )
             )
+            self._chars = None
+            self._sensor_chars = None
+            self._notify_chars.clear()
+            if self._closed:
+                # Closed while connecting, so nothing else would close the connection
+                await self._disconnect()
+                raise DisconnectedError(f"Connection to {ble_device.address} is closed")
+            # The first sync reads the firmware version anyway
+            self._check_fw_version = self.device_info.did_first_sync
+        client = self._client
         try:
             async with interrupt(
-                disconnect_future,
+                self._disconnect_future,
                 DisconnectedError,
-                f"Disconnected from {self._client.address}",
+                f"Disconnected from {client.address}",
             ), asyncio_timeout(UPDATE_TIMEOUT):
                 await self._get_device_characteristics()
                 await self._get_service_characteristics()
-                #if self._persistent:
-                #    # Receive the device data with notifications
-                #    await self._setup_notifications()
-        except BleakError as err:
-            if "not found" in str(err):  # In future bleak this is a named exception
+                if self._persistent:
+                    # Receive the device data with notifications
+                    await self._setup_notifications()
+        except (BleakError, DisconnectedError, asyncio.TimeoutError) as err:
+            if isinstance(err, BleakError) and _is_not_found(err):
                 # Clear the char cache since a char is likely
                 # missing from the cache
-                await self._client.clear_cache()
+                await client.clear_cache()
+            # The connection can't be trusted anymore (and the resolved characteristics
+            # could be stale), so the next attempt establishes a new one. The device
+            # could be unresponsive, so don't wait for it to unsubscribe.
+            await self._disconnect(stop_notify=False)
             raise
         finally:
             if not self._persistent:
-                await self._client.disconnect()
-                self._client = None
+                await self._disconnect()
 
         return self._device